@@ -1,35 +1,72 @@
 import os
 import csv
 import zipfile
-import shutil
-import re
 import argparse
+import itertools
+import struct
+import queue
+import threading
 import logging
+import logging.handlers
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from datetime import datetime
-from io import BytesIO
+
+# Optional ISA-L backend: isal_zlib is a drop-in zlib replacement with a much faster
+# DEFLATE engine. zipfile looks up its (de)compressors through its module-level zlib name.
+try:
+    from isal import isal_zlib
+    zipfile.zlib = isal_zlib
+except ImportError:
+    pass
+
+# Optional zlib-ng backend for the CRC32 that zipfile computes over every page it
+# decompresses or compresses; its SIMD implementation replaces the table-driven one.
+try:
+    from zlib_ng import zlib_ng
+    zipfile.crc32 = zlib_ng.crc32
+except ImportError:
+    pass
+
+def _find_volume_digits(name):
+    """
+    Scan an uppercased filename for a 'V' followed by digits.
+    Returns the digit string of the first match, or None if not found.
+    """
+    i = name.find('V')
+    while i != -1:
+        j = i + 1
+        while j < len(name) and name[j].isdecimal():
+            j += 1
+        if j > i + 1:
+            return name[i + 1:j]
+        i = name.find('V', i + 1)
+    return None
 
 def is_special_file(filename):
     """Check if a CBZ file is a 'special' based on naming pattern SP01, SP02, etc."""
     # Matches patterns like SP01, SP02, etc. (case-insensitive)
-    pattern = r'(?i)SP\d{2}'
-    return bool(re.search(pattern, filename))
-
-def is_volume_file(filename):
-    """Check if a CBZ file already has a volume pattern VXXX or V001, V002, etc."""
-    # Matches patterns like V001, V01, V1, etc. (case-insensitive)
-    pattern = r'(?i)V\d+'
-    return bool(re.search(pattern, filename))
+    name = filename.upper()
+    i = name.find('SP')
+    while i != -1:
+        digits = name[i + 2:i + 4]
+        if len(digits) == 2 and digits.isdecimal():
+            return True
+        i = name.find('SP', i + 1)
+    return False
 
 def extract_volume_number(filename):
     """Extract the volume number from a filename with VXXX pattern. Returns None if not found."""
     # Matches patterns like V001, V01, V1, etc. (case-insensitive)
-    pattern = r'(?i)V(\d+)'
-    match = re.search(pattern, filename)
-    if match:
-        return int(match.group(1))
+    digits = _find_volume_digits(filename.upper())
+    if digits is not None:
+        return int(digits)
     return None
 
+# Number of log records buffered in memory before they are written to the log file
+LOG_BUFFER_CAPACITY = 100
+
 def setup_logging(base_path):
     """Setup logging to file and console."""
     log_file = Path(base_path) / f"cbz_refactor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
@@ -38,11 +75,14 @@ def setup_logging(base_path):
     logger = logging.getLogger('cbz_refactor')
     logger.setLevel(logging.INFO)
     
-    # File handler
+    # File handler, buffered so records are written in blocks (errors flush immediately)
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(logging.INFO)
     file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(file_formatter)
+    buffered_file_handler = logging.handlers.MemoryHandler(
+        LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler
+    )
     
     # Console handler
     console_handler = logging.StreamHandler()
@@ -51,7 +91,7 @@ def setup_logging(base_path):
     console_handler.setFormatter(console_formatter)
     
     # Add handlers
-    logger.addHandler(file_handler)
+    logger.addHandler(buffered_file_handler)
     logger.addHandler(console_handler)
     
     return logger
@@ -80,27 +120,42 @@ def parse_batch_sizes(batch_str):
         except ValueError:
             raise ValueError(f"Invalid batch size: {batch_str}")
 
+# Accepted boolean spellings in the CSV (matched after lowercasing)
+BOOL_VALUES = {
+    'true': True, 'yes': True, '1': True, 't': True, 'y': True,
+    'false': False, 'no': False, '0': False, 'f': False, 'n': False,
+}
+
 def parse_bool(value, default=True):
     """
     Parse a boolean value from CSV. Returns default if empty/missing.
     Accepts: true/false, yes/no, 1/0, t/f, y/n (case-insensitive)
     """
-    if not value or not value.strip():
+    value = value.strip().lower() if value else ''
+    if not value:
         return default
     
-    value = value.strip().lower()
-    
-    if value in ('true', 'yes', '1', 't', 'y'):
-        return True
-    elif value in ('false', 'no', '0', 'f', 'n'):
-        return False
-    else:
+    try:
+        return BOOL_VALUES[value]
+    except KeyError:
         raise ValueError(f"Invalid boolean value: {value}")
 
+def parse_csv_line(line):
+    """
+    Split a CSV line into fields. Plain lines are split directly;
+    only lines containing quotes (e.g. "3,4,5,3") go through the csv module.
+    """
+    if not line:
+        return []
+    if '"' in line:
+        return next(csv.reader([line]))
+    return line.split(',')
+
 def calculate_batches(num_files, batch_sizes, is_repeating, no_extra, logger):
     """
     Calculate how files should be batched.
-    Returns list of batch sizes to use.
+    Returns tuple of (batch_sizes, num_batches). For a repeating size, batch_sizes is
+    an itertools.repeat iterator instead of a list, so no list of identical sizes is built.
     If no_extra is True, doesn't create partial batches for remaining files.
     """
     if is_repeating:
@@ -115,7 +170,7 @@ def calculate_batches(num_files, batch_sizes, is_repeating, no_extra, logger):
         else:
             # Create all batches including partial last one
             num_batches = (num_files + batch_size - 1) // batch_size
-        return [batch_size] * num_batches
+        return itertools.repeat(batch_size, num_batches), num_batches
     
     # Multiple specified sizes
     total_specified = sum(batch_sizes)
@@ -129,14 +184,14 @@ def calculate_batches(num_files, batch_sizes, is_repeating, no_extra, logger):
                 break
             result.append(min(size, remaining))
             remaining -= size
-        return result
+        return result, len(result)
     
     # We have more files than specified
     if no_extra:
         # Only use the specified batches, leave remaining files as-is
         remaining = num_files - total_specified
         logger.info(f"With no-extra: {remaining} files will remain as individual CBZ files")
-        return batch_sizes.copy()
+        return batch_sizes.copy(), len(batch_sizes)
     
     # Original behavior: create additional batches for remaining files
     remaining = num_files - total_specified
@@ -154,51 +209,286 @@ def calculate_batches(num_files, batch_sizes, is_repeating, no_extra, logger):
             result.append(remaining)
             remaining = 0
     
-    return result
+    return result, len(result)
+
+# Page formats copied into the new volumes (matched case-insensitively)
+IMAGE_EXTENSIONS = frozenset(('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp'))
+
+# Image formats that are not entropy-coded and still benefit from DEFLATE.
+# Everything else (JPEG, PNG, WebP, GIF) is already compressed and is stored as-is.
+DEFLATE_EXTENSIONS = {'.bmp'}
+
+def file_extension(filename):
+    """Return the extension of an archive entry name, like Path.suffix but without building a Path."""
+    dot = filename.rfind('.')
+    if dot > filename.rfind('/') + 1 and dot < len(filename) - 1:
+        return filename[dot:]
+    return ''
+
+def page_compress_type(ext):
+    """Return the compression method a page with the given extension should be stored with."""
+    if ext.lower() in DEFLATE_EXTENSIONS:
+        return zipfile.ZIP_DEFLATED
+    return zipfile.ZIP_STORED
+
+def can_copy_raw(file_info, ext):
+    """
+    Check if an archive entry can be copied without decompressing it,
+    i.e. it is unencrypted and already uses the compression wanted for the page.
+    """
+    if file_info.flag_bits & 0x1:
+        return False
+    return file_info.compress_type == page_compress_type(ext)
+
+# Chunk size used when streaming page data between archives
+COPY_CHUNK_SIZE = 256 * 1024
+
+# Number of items that may be queued between the reader and writer threads of a volume
+PIPELINE_DEPTH = 8
+
+# Upper bound on volumes built at the same time (each one keeps a source and the output open)
+MAX_BATCH_WORKERS = 4
 
-def extract_cbz_to_memory(cbz_path, logger):
-    """Extract a CBZ file to memory and return list of (filename, data) tuples."""
+def list_cbz_images(zip_ref):
+    """Return (file_info, ext) pairs for the image entries of an open CBZ archive, sorted by filename."""
+    images = []
+    
+    # Get all files in the archive, sorted by filename up front so pages come out in order
+    for file_info in sorted(zip_ref.filelist, key=attrgetter('filename')):
+        # Compute the extension once; it is reused when naming and writing the page.
+        # ComicInfo.xml and any other non-image entries are skipped by the extension check.
+        ext = file_extension(file_info.filename)
+        if ext.lower() in IMAGE_EXTENSIONS:
+            images.append((file_info, ext))
+    
+    return images
+
+# Raw copying relies on undocumented zipfile internals, because zipfile has no public API
+# for reading or writing an entry's compressed bytes:
+# - the local header layout constants structFileHeader, sizeFileHeader and stringFileHeader;
+# - ZipFile.fp, positioned by us to read (source) or append (output) entry data;
+# - ZipFile.filelist, NameToInfo and start_dir, updated the way ZipFile.write() does so
+#   close() writes the central directory for raw entries too;
+# - ZipFile._writing, which must be false: a raw entry cannot be interleaved with an
+#   entry opened through ZipFile.open(). ZipFile._lock is not taken, so the output must
+#   only be written from one thread (write_pages() is its only writer).
+# tests/test_cbz_refactor.py round-trips stored, deflated and BMP pages through this path.
+
+def seek_raw_data(zip_ref, file_info):
+    """Position the archive file at the still-compressed bytes of an entry, skipping its local header."""
+    zip_ref.fp.seek(file_info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, zip_ref.fp.read(zipfile.sizeFileHeader))
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local file header for {file_info.filename}")
+    
+    # Skip the file name and extra field (fields 10 and 11 of the local header)
+    zip_ref.fp.seek(header[10] + header[11], os.SEEK_CUR)
+
+def start_raw_entry(zipf, zinfo, file_info):
+    """Write the local header of a raw-copied entry, reusing the source CRC and sizes."""
+    if zipf._writing:
+        raise ValueError("Can't write a raw entry while another entry is open for writing")
+    
+    zinfo.compress_type = file_info.compress_type
+    zinfo.CRC = file_info.CRC
+    zinfo.compress_size = file_info.compress_size
+    zinfo.file_size = file_info.file_size
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader())
+
+def finish_raw_entry(zipf, zinfo):
+    """Register a raw-copied entry once its data has been written."""
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+def read_pages(sources, pages, free_buffers, stop):
+    """
+    Producer side of create_volume(): open each source CBZ in turn (closing it before the
+    next one, so open files never grow with batch size), read every page in chunks and queue
+    ('page', file_info, ext, raw), ('chunk', buffer, length) and ('end',) items, then ('done',).
+    Chunks are read into buffers taken from free_buffers, which bounds memory use.
+    Raw-copyable pages are read still compressed; all others are decompressed here.
+    Any failure is queued as ('error', exception) instead of ('done',).
+    """
+    try:
+        for cbz_path in sources:
+            with zipfile.ZipFile(cbz_path, 'r') as zip_ref:
+                if not stream_pages(zip_ref, pages, free_buffers, stop):
+                    pages.put(('done',))
+                    return
+        
+        pages.put(('done',))
+    except Exception as e:
+        pages.put(('error', e))
+
+def stream_pages(zip_ref, pages, free_buffers, stop):
+    """Queue every image page of an open CBZ archive for read_pages(). Returns False if stopped."""
+    for file_info, ext in list_cbz_images(zip_ref):
+        raw = can_copy_raw(file_info, ext)
+        if raw:
+            seek_raw_data(zip_ref, file_info)
+            src = zip_ref.fp
+            size = file_info.compress_size
+        else:
+            src = zip_ref.open(file_info)
+            size = None
+        
+        pages.put(('page', file_info, ext, raw))
+        copied = 0
+        try:
+            while not stop.is_set() and (size is None or copied < size):
+                buffer = free_buffers.get()
+                view = memoryview(buffer)
+                if size is not None:
+                    view = view[:min(len(view), size - copied)]
+                n = src.readinto(view)
+                if not n:
+                    free_buffers.put(buffer)
+                    break
+                pages.put(('chunk', buffer, n))
+                copied += n
+        finally:
+            if not raw:
+                src.close()
+        
+        if stop.is_set():
+            return False
+        if size is not None and copied != size:
+            raise zipfile.BadZipFile(f"Truncated data for {file_info.filename}")
+        pages.put(('end',))
+    
+    return True
+
+def write_chunks(pages, free_buffers, dst):
+    """Write queued chunks of the current page to dst until its ('end',) item, recycling the buffers."""
+    while True:
+        item = pages.get()
+        if item[0] == 'end':
+            return
+        if item[0] == 'error':
+            raise item[1]
+        _, buffer, n = item
+        try:
+            dst.write(memoryview(buffer)[:n])
+        finally:
+            free_buffers.put(buffer)
+
+def write_pages(zipf, pages, free_buffers):
+    """Consumer side of create_volume(): write queued pages with consecutive naming. Returns the page count."""
+    page_count = 0
+    while True:
+        item = pages.get()
+        if item[0] == 'done':
+            return page_count
+        if item[0] == 'error':
+            raise item[1]
+        
+        _, file_info, ext, raw = item
+        page_count += 1
+        zinfo = zipfile.ZipInfo(f"page_{page_count:03d}{ext}", date_time=file_info.date_time)
+        zinfo.external_attr = 0o600 << 16
+        
+        if raw:
+            # Carry the compressed stream over unchanged
+            start_raw_entry(zipf, zinfo, file_info)
+            write_chunks(pages, free_buffers, zipf.fp)
+            finish_raw_entry(zipf, zinfo)
+        else:
+            # Only compress formats that are not already compressed
+            zinfo.compress_type = page_compress_type(ext)
+            zinfo.file_size = file_info.file_size
+            with zipf.open(zinfo, 'w') as dst:
+                write_chunks(pages, free_buffers, dst)
+
+def create_volume(output_path, sources, logger):
+    """
+    Create a CBZ file from the image pages of the source CBZ paths with consecutive naming.
+    A reader thread pulls pages from the sources while this thread writes the output,
+    connected by a bounded queue so reading and writing overlap with flat memory use.
+    """
     try:
-        images = []
-        image_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp'}
+        free_buffers = queue.Queue()
+        for _ in range(PIPELINE_DEPTH + 2):
+            free_buffers.put(bytearray(COPY_CHUNK_SIZE))
+        pages = queue.Queue(maxsize=PIPELINE_DEPTH)
+        stop = threading.Event()
         
-        with zipfile.ZipFile(cbz_path, 'r') as zip_ref:
-            # Get all files in the archive
-            for file_info in zip_ref.filelist:
-                filename_lower = file_info.filename.lower()
-                
-                # Skip ComicInfo.xml and any XML files
-                if filename_lower == 'comicinfo.xml' or filename_lower.endswith('.xml'):
+        reader = threading.Thread(target=read_pages, args=(sources, pages, free_buffers, stop), daemon=True)
+        reader.start()
+        try:
+            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_STORED) as zipf:
+                page_count = write_pages(zipf, pages, free_buffers)
+        except Exception:
+            # Stop the reader and keep draining the queue until it exits, so it never blocks
+            stop.set()
+            while reader.is_alive():
+                try:
+                    item = pages.get(timeout=0.1)
+                except queue.Empty:
                     continue
-                
-                if Path(file_info.filename).suffix.lower() in image_extensions:
-                    # Read file data into memory
-                    file_data = zip_ref.read(file_info.filename)
-                    images.append((file_info.filename, file_data))
+                if item[0] == 'chunk':
+                    free_buffers.put(item[1])
+            raise
+        finally:
+            reader.join()
         
-        # Sort by filename
-        images.sort(key=lambda x: x[0])
-        logger.info(f"Extracted to memory: {cbz_path.name} ({len(images)} images)")
-        return images
+        logger.info("Created: %s (%d pages)", output_path.name, page_count)
     except Exception as e:
-        logger.error(f"Failed to extract {cbz_path.name}: {str(e)}")
+        logger.error("Failed to create %s: %s", output_path.name, e)
         raise
 
-def create_cbz_from_memory(output_path, image_data_list, logger):
-    """Create a CBZ file from in-memory image data with consecutive naming."""
+def process_batch(folder_path, folder_name, volume_number, batch, delete_originals, logger):
+    """Merge one batch of CBZ files into a single volume. Returns True if the volume was created."""
+    logger.info("Processing batch %d (%d files)...", volume_number, len(batch))
+    
+    sources = []
+    
+    # Check each CBZ file in this batch, one open file at a time; pages are read later
+    for cbz_file in batch:
+        cbz_name = cbz_file.name
+        try:
+            with zipfile.ZipFile(cbz_file, 'r') as zip_ref:
+                num_images = len(list_cbz_images(zip_ref))
+            logger.info("Batch %d: reading %s (%d images)", volume_number, cbz_name, num_images)
+            if num_images:
+                sources.append(cbz_file)
+        except Exception as e:
+            logger.error("Batch %d: error processing %s: %s", volume_number, cbz_name, e)
+            continue
+    
+    if not sources:
+        logger.error("No images found in batch %d. Skipping.", volume_number)
+        return False
+    
+    # Create new volume with consecutive page numbering
+    output_name = f"{folder_name} V{volume_number:03d}.cbz"
+    output_path = folder_path / output_name
+    
     try:
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for idx, (original_name, data) in enumerate(image_data_list, start=1):
-                ext = Path(original_name).suffix
-                new_name = f"page_{idx:03d}{ext}"
-                
-                # Write directly from memory to zip
-                zipf.writestr(new_name, data)
-        
-        logger.info(f"Created: {output_path.name} ({len(image_data_list)} pages)")
+        create_volume(output_path, sources, logger)
     except Exception as e:
-        logger.error(f"Failed to create {output_path.name}: {str(e)}")
-        raise
+        logger.error("Failed to create volume %d: %s", volume_number, e)
+        # Don't leave a partially written volume behind
+        if output_path.is_file():
+            output_path.unlink()
+        return False
+    
+    # Delete original CBZ files if requested, logging a single summary line
+    if delete_originals:
+        deleted = []
+        for cbz_file in batch:
+            cbz_name = cbz_file.name
+            try:
+                cbz_file.unlink()
+                deleted.append(cbz_name)
+            except Exception as e:
+                logger.error("Batch %d: failed to delete %s: %s", volume_number, cbz_name, e)
+        
+        if deleted:
+            logger.info("Batch %d: deleted %d originals: %s", volume_number, len(deleted), deleted)
+    
+    return True
 
 def process_directory(base_path, folder_name, batch_sizes_str, no_extra, avoid_volumes, delete_originals, logger):
     """Process a single directory according to the refactoring rules."""
@@ -216,8 +506,12 @@ def process_directory(base_path, folder_name, batch_sizes_str, no_extra, avoid_v
         logger.error(f"Invalid batch configuration for '{folder_name}': {str(e)}")
         return
     
-    # Get all CBZ files
-    cbz_files = sorted([f for f in folder_path.glob("*.cbz")])
+    # Get all CBZ file names; Path objects are only built for files that are touched
+    with os.scandir(folder_path) as entries:
+        cbz_files = sorted(
+            (e.name for e in entries if e.is_file() and e.name.lower().endswith('.cbz')),
+            key=os.path.normcase,  # Same order as sorting Path objects (case-insensitive on Windows)
+        )
     
     if not cbz_files:
         logger.info(f"No CBZ files found in {folder_name}")
@@ -228,11 +522,18 @@ def process_directory(base_path, folder_name, batch_sizes_str, no_extra, avoid_v
     special_files = []
     volume_files = []
     
+    volume_numbers = []
+    
     for cbz in cbz_files:
-        if is_special_file(cbz.name):
+        if is_special_file(cbz):
             special_files.append(cbz)
-        elif avoid_volumes and is_volume_file(cbz.name):
+            continue
+        
+        # A single scan both detects the volume pattern and yields its number
+        vol_num = extract_volume_number(cbz) if avoid_volumes else None
+        if vol_num is not None:
             volume_files.append(cbz)
+            volume_numbers.append(vol_num)
         else:
             regular_files.append(cbz)
     
@@ -243,25 +544,22 @@ def process_directory(base_path, folder_name, batch_sizes_str, no_extra, avoid_v
         
         for special in special_files:
             try:
-                dest = specials_dir / special.name
-                shutil.move(str(special), str(dest))
-                logger.info(f"Moved to Specials: {special.name}")
+                dest = specials_dir / special
+                # Specials stay on the same filesystem, so a single rename is enough
+                os.replace(folder_path / special, dest)
+                logger.info("Moved to Specials: %s", special)
             except Exception as e:
-                logger.error(f"Failed to move {special.name} to Specials: {str(e)}")
+                logger.error("Failed to move %s to Specials: %s", special, e)
     
     # Log volume files that are being skipped
     if volume_files:
-        logger.info(f"Skipping {len(volume_files)} files with volume pattern: {[f.name for f in volume_files]}")
+        logger.info(f"Skipping {len(volume_files)} files with volume pattern: {volume_files}")
     
     # Determine starting volume number
     volume_counter = 1
     if avoid_volumes and volume_files:
         # Find the highest volume number among existing volume files
-        max_volume = 0
-        for vol_file in volume_files:
-            vol_num = extract_volume_number(vol_file.name)
-            if vol_num is not None and vol_num > max_volume:
-                max_volume = vol_num
+        max_volume = max(volume_numbers)
         
         if max_volume > 0:
             volume_counter = max_volume + 1
@@ -272,61 +570,39 @@ def process_directory(base_path, folder_name, batch_sizes_str, no_extra, avoid_v
         return
     
     # Calculate actual batches to use
-    actual_batches = calculate_batches(len(regular_files), batch_sizes, is_repeating, no_extra, logger)
-    logger.info(f"Will create {len(actual_batches)} volumes with sizes: {actual_batches}")
+    actual_batches, num_batches = calculate_batches(len(regular_files), batch_sizes, is_repeating, no_extra, logger)
+    if is_repeating:
+        logger.info(f"Will create {num_batches} volumes with size: {batch_sizes[0]}")
+    else:
+        logger.info(f"Will create {num_batches} volumes with sizes: {actual_batches}")
     
-    # Process files according to calculated batches
+    # Pre-assign files and volume numbers so batches can be written concurrently
+    jobs = []
     file_index = 0
     
     for batch_size in actual_batches:
-        batch = regular_files[file_index:file_index + batch_size]
+        batch = [folder_path / name for name in regular_files[file_index:file_index + batch_size]]
         file_index += batch_size
-        
-        logger.info(f"Processing batch {volume_counter} ({len(batch)} files)...")
-        
-        all_images = []
-        
-        # Extract all CBZ files in this batch to memory
-        for cbz_file in batch:
+        jobs.append((volume_counter, batch))
+        volume_counter += 1
+    
+    # Batches are independent; zlib and file I/O release the GIL, so threads are enough
+    max_workers = min(MAX_BATCH_WORKERS, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (volume_number, executor.submit(process_batch, folder_path, folder_name, volume_number, batch, delete_originals, logger))
+            for volume_number, batch in jobs
+        ]
+        for volume_number, future in futures:
             try:
-                images = extract_cbz_to_memory(cbz_file, logger)
-                all_images.extend(images)
+                future.result()
             except Exception as e:
-                logger.error(f"Error processing {cbz_file.name}: {str(e)}")
-                continue
-        
-        if not all_images:
-            logger.error(f"No images found in batch {volume_counter}. Skipping.")
-            volume_counter += 1
-            continue
-        
-        # Create new volume with consecutive page numbering
-        output_name = f"{folder_name} V{volume_counter:03d}.cbz"
-        output_path = folder_path / output_name
-        
-        try:
-            create_cbz_from_memory(output_path, all_images, logger)
-            
-            # Delete original CBZ files if requested
-            if delete_originals:
-                for cbz_file in batch:
-                    try:
-                        cbz_file.unlink()
-                        logger.info(f"Deleted: {cbz_file.name}")
-                    except Exception as e:
-                        logger.error(f"Failed to delete {cbz_file.name}: {str(e)}")
-            
-            volume_counter += 1
-        except Exception as e:
-            logger.error(f"Failed to create volume {volume_counter}: {str(e)}")
-        finally:
-            # Clear memory
-            all_images.clear()
+                logger.error(f"Error processing batch {volume_number} of '{folder_name}': {str(e)}")
     
     # Log info about remaining files if any
     if file_index < len(regular_files):
         remaining_files = regular_files[file_index:]
-        logger.info(f"Left {len(remaining_files)} files as individual CBZ files: {[f.name for f in remaining_files]}")
+        logger.info(f"Left {len(remaining_files)} files as individual CBZ files: {remaining_files}")
 
 def main(base_directory):
     """Main function to orchestrate the refactoring process."""
@@ -347,42 +623,42 @@ def main(base_directory):
     
     # Read CSV file
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
+        text = csv_file.read_text(encoding='utf-8')
+        
+        for row_num, line in enumerate(text.splitlines(), start=1):
+            row = parse_csv_line(line)
+            if len(row) < 1:
+                logger.error(f"Invalid row {row_num}: {row}. Skipping.")
+                continue
             
-            for row_num, row in enumerate(reader, start=1):
-                if len(row) < 1:
-                    logger.error(f"Invalid row {row_num}: {row}. Skipping.")
-                    continue
-                
-                folder_name = row[0].strip()
-                
-                # Check if batch_sizes is provided
-                if len(row) < 2 or not row[1].strip():
-                    logger.info(f"No batch size specified for '{folder_name}'. Skipping.")
-                    continue
-                
-                batch_sizes_str = row[1].strip()
-                
-                # Parse optional columns with defaults = True
-                try:
-                    no_extra = parse_bool(row[2], default=True) if len(row) > 2 else True
-                    avoid_volumes = parse_bool(row[3], default=True) if len(row) > 3 else True
-                    delete_originals = parse_bool(row[4], default=True) if len(row) > 4 else True
-                    ignore = parse_bool(row[5], default=False) if len(row) > 5 else False  # Default is False (don't ignore)
-                except ValueError as e:
-                    logger.error(f"Invalid boolean value in row {row_num}: {str(e)}. Using defaults.")
-                    no_extra = True
-                    avoid_volumes = True
-                    delete_originals = True
-                    ignore = False
-                
-                # Check if series should be ignored
-                if ignore:
-                    logger.info(f"Series '{folder_name}' marked as ignored. Skipping.")
-                    continue
-                
-                process_directory(base_path, folder_name, batch_sizes_str, no_extra, avoid_volumes, delete_originals, logger)
+            folder_name = row[0].strip()
+            
+            # Check if batch_sizes is provided
+            if len(row) < 2 or not row[1].strip():
+                logger.info(f"No batch size specified for '{folder_name}'. Skipping.")
+                continue
+            
+            batch_sizes_str = row[1].strip()
+            
+            # Parse optional columns with defaults = True
+            try:
+                no_extra = parse_bool(row[2], default=True) if len(row) > 2 else True
+                avoid_volumes = parse_bool(row[3], default=True) if len(row) > 3 else True
+                delete_originals = parse_bool(row[4], default=True) if len(row) > 4 else True
+                ignore = parse_bool(row[5], default=False) if len(row) > 5 else False  # Default is False (don't ignore)
+            except ValueError as e:
+                logger.error(f"Invalid boolean value in row {row_num}: {str(e)}. Using defaults.")
+                no_extra = True
+                avoid_volumes = True
+                delete_originals = True
+                ignore = False
+            
+            # Check if series should be ignored
+            if ignore:
+                logger.info(f"Series '{folder_name}' marked as ignored. Skipping.")
+                continue
+            
+            process_directory(base_path, folder_name, batch_sizes_str, no_extra, avoid_volumes, delete_originals, logger)
     except Exception as e:
         logger.error(f"Error reading CSV file: {str(e)}")
         return
@@ -390,7 +666,7 @@ def main(base_directory):
     logger.info("=== Refactoring complete! ===")
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Refactor CBZ files based on CSV configuration (in-memory processing)')
+    parser = argparse.ArgumentParser(description='Refactor CBZ files based on CSV configuration (streaming processing)')
     parser.add_argument('directory', help='Base directory containing to_refactor.csv and folders to process')
     
     args = parser.parse_args()
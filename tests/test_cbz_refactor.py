@@ -0,0 +1,76 @@
+import logging
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import cbz_refactor
+
+
+class RawCopyRoundTripTest(unittest.TestCase):
+    """Round-trip pages through create_volume(), covering the raw-copy path."""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self._tmp.name)
+        self.logger = logging.getLogger('cbz_refactor_test')
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def make_cbz(self, name, entries):
+        path = self.tmp_path / name
+        with zipfile.ZipFile(path, 'w') as zipf:
+            for filename, data, compress_type in entries:
+                zipf.writestr(filename, data, compress_type=compress_type)
+        return path
+    
+    def test_stored_deflated_and_bmp_pages(self):
+        # Larger than COPY_CHUNK_SIZE so pages span several chunks
+        jpg = os.urandom(cbz_refactor.COPY_CHUNK_SIZE + 1000)
+        bmp = b'BM' + bytes(range(256)) * 2000
+        entries = [
+            ('a_stored.jpg', jpg, zipfile.ZIP_STORED),         # raw copy
+            ('b_deflated.JPG', jpg[::-1], zipfile.ZIP_DEFLATED),  # inflated, then stored
+            ('c_stored.bmp', bmp, zipfile.ZIP_STORED),         # deflated
+            ('d_deflated.bmp', bmp[::-1], zipfile.ZIP_DEFLATED),  # raw copy
+            ('ComicInfo.xml', b'<ComicInfo/>', zipfile.ZIP_DEFLATED),
+        ]
+        first = self.make_cbz('first.cbz', entries)
+        second = self.make_cbz('second.cbz', entries[:2])
+        output = self.tmp_path / 'out.cbz'
+        
+        cbz_refactor.create_volume(output, [first, second], self.logger)
+        
+        with zipfile.ZipFile(output) as zipf:
+            self.assertIsNone(zipf.testzip())
+            result = [(info.filename, info.compress_type, zipf.read(info)) for info in zipf.infolist()]
+        
+        self.assertEqual(result, [
+            ('page_001.jpg', zipfile.ZIP_STORED, jpg),
+            ('page_002.JPG', zipfile.ZIP_STORED, jpg[::-1]),
+            ('page_003.bmp', zipfile.ZIP_DEFLATED, bmp),
+            ('page_004.bmp', zipfile.ZIP_DEFLATED, bmp[::-1]),
+            ('page_005.jpg', zipfile.ZIP_STORED, jpg),
+            ('page_006.JPG', zipfile.ZIP_STORED, jpg[::-1]),
+        ])
+    
+    def test_raw_entry_refused_while_entry_open(self):
+        source = self.make_cbz('source.cbz', [('1.jpg', b'data', zipfile.ZIP_STORED)])
+        with zipfile.ZipFile(source) as src:
+            file_info = src.infolist()[0]
+        
+        with zipfile.ZipFile(self.tmp_path / 'out.cbz', 'w') as zipf:
+            with zipf.open('open.jpg', 'w'):
+                with self.assertRaises(ValueError):
+                    cbz_refactor.start_raw_entry(zipf, zipfile.ZipInfo('page_001.jpg'), file_info)
+
+
+if __name__ == '__main__':
+    unittest.main()